@@ -4,12 +4,17 @@ Inspiré du pipeline DNA existant
 """
 from datetime import datetime, timedelta
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 from airflow.operators.bash import BashOperator
 from airflow.hooks.postgres_hook import PostgresHook
 from airflow.models import Variable
 from airflow.exceptions import AirflowSkipException
+from airflow.utils.trigger_rule import TriggerRule
 import hashlib
+import functools
+import io
+import itertools
+import operator
 import os
 import json
 import shutil
@@ -18,7 +23,14 @@ import random
 import logging
 from enum import Enum
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import sys
+import psycopg2.extras
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Ajouter utils au path
 # Le dossier utils est monté dans /opt/airflow/utils selon docker-compose.yml
@@ -43,13 +55,23 @@ DEFAULT_INPUT_DIR = '/opt/airflow/data/input'
 OUTPUT_DIR = '/opt/airflow/data/output'
 PROCESSED_DIR = '/opt/airflow/data/processed'
 DEAD_LETTER_DIR = '/opt/airflow/data/dead_letter'
-TEMP_DIR = '/opt/airflow/temp'
+# Sous /opt/airflow/data (volume monté sur tous les workers Celery): fichiers de passage entre tâches
+TEMP_DIR = '/opt/airflow/data/temp'
 
 # Configuration de la gestion d'erreurs
 BASE_DELAY = 1
 MAX_DELAY = 60
 JITTER_FACTOR = 0.1
 CIRCUIT_BREAKER_TIMEOUT = 300
+# Redis partagé (broker Celery) pour l'état du circuit breaker entre workers
+CIRCUIT_BREAKER_REDIS_URL = os.environ.get('AIRFLOW__CELERY__BROKER_URL', 'redis://redis:6379/0')
+
+# Hash des fichiers d'entrée en parallèle (le GIL est relâché pendant hashlib.file_digest)
+HASH_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Insertion des oligos en masse
+OLIGO_INSERT_PAGE_SIZE = 1000
+OLIGO_COPY_THRESHOLD = 10000
 
 # Valeurs par défaut des variables Airflow
 DEFAULT_CHUNK_SIZE = 100
@@ -57,6 +79,15 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
 DEFAULT_ERROR_CORRECTION_SYMBOLS = 10
 
+# Algorithme de hash des fichiers (blake3 si fourni par OpenSSL, sinon sha256)
+# Le hash stocké est préfixé par l'algorithme: '<algo>:<hexdigest>'
+FILE_HASH_ALGO = 'blake3' if 'blake3' in hashlib.algorithms_available else 'sha256'
+
+# Configuration du pipeline dans une seule variable JSON (anciennes variables par clé en repli)
+CONFIG_VARIABLE = 'dna_pipeline_config'
+LEGACY_CONFIG_KEYS = ('input_directory', 'chunk_size', 'max_retries',
+                      'circuit_breaker_threshold', 'error_correction_symbols')
+
 # Configuration logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -86,6 +117,8 @@ class RetryConfig:
     max_delay: float = MAX_DELAY
     jitter_factor: float = JITTER_FACTOR
     exponential_base: float = 2.0
+    # 'decorrelated' (AWS), 'full' (uniforme sur [0, exp]) ou 'exponential' (exp ± jitter_factor)
+    jitter_strategy: str = "decorrelated"
 
 
 @dataclass
@@ -144,22 +177,78 @@ class CircuitBreaker:
         return time.time() - self.last_failure_time >= self.config.timeout
 
 
+class RedisCircuitBreaker(CircuitBreaker):
+    """Circuit breaker dont l'état est partagé via Redis (survit aux redémarrages de tâches)"""
+    
+    def __init__(self, config: CircuitBreakerConfig, name: str, client):
+        super().__init__(config)
+        self.client = client
+        self.fail_key = f"cb:{name}:fail"
+        self.state_key = f"cb:{name}:state"
+    
+    def can_execute(self) -> bool:
+        """Vérifie si exécution autorisée (ouvert tant que la clé d'état n'a pas expiré)"""
+        try:
+            return self.client.get(self.state_key) != b"open"
+        except redis.RedisError as e:
+            logger.warning(f"Redis indisponible, circuit breaker local: {e}")
+            return super().can_execute()
+    
+    def record_success(self):
+        """Enregistre succès"""
+        try:
+            self.client.delete(self.fail_key)
+        except redis.RedisError:
+            super().record_success()
+    
+    def record_failure(self):
+        """Enregistre échec (ouvre le circuit pour config.timeout secondes au seuil)"""
+        try:
+            failures = self.client.incr(self.fail_key)
+            if failures == 1:
+                # Fenêtre glissante: seuls les échecs rapprochés (< timeout) s'additionnent
+                self.client.expire(self.fail_key, self.config.timeout)
+            if failures >= self.config.failure_threshold:
+                self.client.setex(self.state_key, self.config.timeout, "open")
+        except redis.RedisError:
+            super().record_failure()
+
+
+class DatabaseUnavailableError(Exception):
+    """Échec d'accès à la base (compté par le circuit breaker, contrairement aux erreurs de fichier)"""
+
+
+# Erreurs qui concernent la base (et non le fichier traité): seules à faire avancer le circuit breaker
+DB_ERRORS = (psycopg2.Error, DatabaseUnavailableError)
+
+
 class RetryManager:
     """Gestionnaire de retry"""
     
     def __init__(self, config: RetryConfig):
         self.config = config
     
-    def calculate_delay(self, attempt: int) -> float:
+    def calculate_delay(self, attempt: int, prev_delay: float = None) -> float:
         """Calcule délai"""
-        delay = self.config.base_delay * (self.config.exponential_base ** attempt)
-        delay = min(delay, self.config.max_delay)
+        base = self.config.base_delay
+        cap = self.config.max_delay
+        
+        if self.config.jitter_strategy == "decorrelated":
+            # sleep = min(cap, uniform(base, prev_sleep * 3))
+            prev = base if prev_delay is None else max(base, prev_delay)
+            return min(cap, random.uniform(base, prev * 3))
+        
+        delay = min(base * (self.config.exponential_base ** attempt), cap)
+        if self.config.jitter_strategy == "full":
+            return random.uniform(0, delay)
+        
         jitter = delay * self.config.jitter_factor * (2 * random.random() - 1)
         return max(0, delay + jitter)
     
     def execute_with_retry(self, func, *args, **kwargs):
         """Exécute avec retry"""
         last_exception = None
+        delay = None
         
         for attempt in range(self.config.max_retries + 1):
             try:
@@ -173,21 +262,23 @@ class RetryManager:
                     break
                 
                 if attempt < self.config.max_retries:
-                    delay = self.calculate_delay(attempt)
+                    delay = self.calculate_delay(attempt, delay)
                     time.sleep(delay)
         
         raise last_exception
 
 
-# Instances globales
-circuit_breaker = None
-retry_manager = None
+def create_circuit_breaker(config: CircuitBreakerConfig, name: str = 'postgres_default') -> CircuitBreaker:
+    """Circuit breaker partagé via Redis si disponible, sinon local au process"""
+    if redis is None:
+        return CircuitBreaker(config)
+    client = redis.Redis.from_url(CIRCUIT_BREAKER_REDIS_URL, socket_timeout=2)
+    return RedisCircuitBreaker(config, name, client)
 
 
-def initialize_components():
-    """Initialise composants"""
-    global circuit_breaker, retry_manager
-    
+@functools.lru_cache(maxsize=1)
+def get_components():
+    """Circuit breaker et retry manager, construits une seule fois par process"""
     config = get_config_variables()
     
     retry_config = RetryConfig(max_retries=config['max_retries'])
@@ -196,94 +287,167 @@ def initialize_components():
         timeout=300
     )
     
-    circuit_breaker = CircuitBreaker(circuit_config)
-    retry_manager = RetryManager(retry_config)
-    
     logger.info("Composants initialisés")
+    return create_circuit_breaker(circuit_config), RetryManager(retry_config)
 
 
 def get_input_dir():
-    """Récupère répertoire d'entrée"""
+    """Récupère répertoire d'entrée (depuis la configuration JSON, déjà en cache)"""
+    return get_config_variables()['input_directory']
+
+
+def get_legacy_config_variables() -> dict:
+    """Anciennes variables par clé (input_directory, chunk_size...), lues si dna_pipeline_config est absente"""
+    raw = {}
+    for key in LEGACY_CONFIG_KEYS:
+        try:
+            value = Variable.get(key, default_var=None)
+        except Exception:
+            value = None
+        if value is not None:
+            raw[key] = value
+    if raw:
+        logger.warning(
+            f"Variable {CONFIG_VARIABLE} absente - anciennes variables utilisées ({', '.join(raw)}); "
+            f"elle sera créée par la tâche setup_airflow_variables"
+        )
+    return raw
+
+
+def seed_pipeline_config(**context):
+    """Crée dna_pipeline_config (depuis les anciennes variables) si absente, sans écriture sinon"""
     try:
-        return Variable.get("input_directory", default_var=DEFAULT_INPUT_DIR)
+        existing = Variable.get(CONFIG_VARIABLE, default_var=None)
     except Exception:
-        return DEFAULT_INPUT_DIR
+        existing = None
+    if existing is not None:
+        return {'seeded': False}
+    
+    config = get_config_variables()
+    Variable.set(CONFIG_VARIABLE, config, serialize_json=True)
+    logger.info(f"Variable {CONFIG_VARIABLE} créée: {config}")
+    return {'seeded': True}
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_variables():
-    """Récupère toutes les variables de configuration depuis Airflow avec valeurs par défaut"""
-    config = {}
+    """Récupère la configuration depuis la variable JSON 'dna_pipeline_config' (une seule lecture par process)"""
+    defaults = {
+        'input_directory': DEFAULT_INPUT_DIR,
+        'chunk_size': DEFAULT_CHUNK_SIZE,
+        'max_retries': DEFAULT_MAX_RETRIES,
+        'circuit_breaker_threshold': DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        'error_correction_symbols': DEFAULT_ERROR_CORRECTION_SYMBOLS,
+    }
     
-    # input_directory - valeur par défaut si variable n'existe pas
     try:
-        config['input_directory'] = Variable.get("input_directory", default_var=DEFAULT_INPUT_DIR)
+        raw = Variable.get(CONFIG_VARIABLE, default_var=None, deserialize_json=True)
     except Exception:
-        config['input_directory'] = DEFAULT_INPUT_DIR
-    
-    # chunk_size - valeur par défaut si variable n'existe pas
-    try:
-        value = Variable.get("chunk_size", default_var=str(DEFAULT_CHUNK_SIZE))
-        config['chunk_size'] = int(value)
-    except (ValueError, TypeError, Exception):
-        config['chunk_size'] = DEFAULT_CHUNK_SIZE
-    
-    # max_retries - valeur par défaut si variable n'existe pas
-    try:
-        value = Variable.get("max_retries", default_var=str(DEFAULT_MAX_RETRIES))
-        config['max_retries'] = int(value)
-    except (ValueError, TypeError, Exception):
-        config['max_retries'] = DEFAULT_MAX_RETRIES
-    
-    # circuit_breaker_threshold - valeur par défaut si variable n'existe pas
-    try:
-        value = Variable.get("circuit_breaker_threshold", default_var=str(DEFAULT_CIRCUIT_BREAKER_THRESHOLD))
-        config['circuit_breaker_threshold'] = int(value)
-    except (ValueError, TypeError, Exception):
-        config['circuit_breaker_threshold'] = DEFAULT_CIRCUIT_BREAKER_THRESHOLD
+        raw = None
+    if raw is None:
+        raw = get_legacy_config_variables()
+    if not isinstance(raw, dict):
+        logger.warning("Variable dna_pipeline_config invalide - valeurs par défaut utilisées")
+        raw = {}
     
-    # error_correction_symbols - valeur par défaut si variable n'existe pas
-    try:
-        value = Variable.get("error_correction_symbols", default_var=str(DEFAULT_ERROR_CORRECTION_SYMBOLS))
-        config['error_correction_symbols'] = int(value)
-    except (ValueError, TypeError, Exception):
-        config['error_correction_symbols'] = DEFAULT_ERROR_CORRECTION_SYMBOLS
+    # Valider une fois: valeur par défaut si absente ou non convertible
+    config = {'input_directory': str(raw.get('input_directory') or DEFAULT_INPUT_DIR)}
+    for key in ('chunk_size', 'max_retries', 'circuit_breaker_threshold', 'error_correction_symbols'):
+        try:
+            config[key] = int(raw.get(key, defaults[key]))
+        except (ValueError, TypeError):
+            config[key] = defaults[key]
     
     return config
 
 
-def update_file_status(file_hash: str, status: str, file_path: str = None, file_size: int = None, **context):
-    """Met à jour ou crée le statut du fichier"""
+@functools.lru_cache(maxsize=4)
+def get_encoder(chunk_size: int, error_correction: int) -> DNAStorage:
+    """Encodeur DNAStorage construit une seule fois par configuration"""
+    return DNAStorage(
+        chunk_size=chunk_size,
+        redundancy=3,
+        error_correction=error_correction,
+        segment_nt=120,
+        reseed_attempts=4,
+        workers=1  # les fichiers sont déjà répartis sur un pool de processus
+    )
+
+
+def compute_file_hash(file_path: str):
+    """Calcule hash (streaming, mémoire constante) et taille d'un fichier"""
+    with open(file_path, 'rb', buffering=0) as f:
+        file_size = os.fstat(f.fileno()).st_size
+        digest = hashlib.file_digest(f, FILE_HASH_ALGO).hexdigest()
+    return f"{FILE_HASH_ALGO}:{digest}", file_size
+
+
+def short_hash(file_hash: str) -> str:
+    """Début du digest pour les logs (sans le préfixe '<algo>:')"""
+    return file_hash.split(':', 1)[-1][:8]
+
+
+def compute_bytes_hash(data: bytes, reference_hash: str) -> str:
+    """Hash des données avec le même algorithme que reference_hash"""
+    if ':' not in reference_hash:
+        # Anciennes entrées: MD5 sans préfixe
+        return hashlib.md5(data).hexdigest()
+    algo = reference_hash.split(':', 1)[0]
+    return f"{algo}:{hashlib.new(algo, data).hexdigest()}"
+
+
+def get_db_connection():
+    """Ouvre une connexion Postgres à partager entre les requêtes d'une tâche"""
+    return PostgresHook(postgres_conn_id='postgres_default').get_conn()
+
+
+def update_file_status(conn, file_hash: str, status: str, file_path: str = None, file_size: int = None, **context):
+    """Met à jour ou crée le statut du fichier, retourne son id (None si échec)"""
     try:
-        hook = PostgresHook(postgres_conn_id='postgres_default')
-        
-        # Vérifier si le fichier existe
-        check_sql = "SELECT id, file_path, file_size FROM processed_files WHERE file_hash = %s"
-        existing = hook.get_first(check_sql, parameters=[file_hash])
+        # Créer ou mettre à jour l'entrée en une seule requête (file_path/file_size
+        # ne servent qu'à la création, une entrée existante garde les siens)
+        upsert_sql = """
+            INSERT INTO processed_files (file_hash, file_path, file_size, status, processed_at)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (file_hash) DO UPDATE
+            SET status = EXCLUDED.status, processed_at = CURRENT_TIMESTAMP
+            RETURNING id
+        """
+        with conn.cursor() as cur:
+            cur.execute(upsert_sql, [file_hash, file_path or '', file_size or 0, status])
+            row = cur.fetchone()
+        conn.commit()
         
-        if existing:
-            # Mettre à jour
-            update_sql = """
-                UPDATE processed_files 
-                SET status = %s, processed_at = CURRENT_TIMESTAMP 
-                WHERE file_hash = %s
-            """
-            hook.run(update_sql, parameters=[status, file_hash])
-            logger.info(f"Statut mis à jour: {file_hash[:8]}... → {status}")
-        else:
-            # Créer nouvelle entrée
-            if not file_path or file_size is None:
-                logger.warning(f"Données manquantes pour créer l'entrée: file_path={file_path}, file_size={file_size}")
-                return
-            
-            insert_sql = """
-                INSERT INTO processed_files (file_hash, file_path, file_size, status, processed_at)
-                VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-            """
-            hook.run(insert_sql, parameters=[file_hash, file_path, file_size, status])
-            logger.info(f"Nouvelle entrée créée: {file_hash[:8]}... → {status}")
+        logger.info(f"Statut mis à jour: {short_hash(file_hash)}... → {status}")
+        return row[0]
             
     except Exception as e:
+        conn.rollback()
         logger.error(f"Erreur mise à jour statut: {e}")
+        return None
+
+
+def insert_oligos(conn, file_id: int, oligos) -> None:
+    """Insère les oligos d'un fichier en une seule transaction (execute_values, COPY si très nombreux)"""
+    if not oligos:
+        return
+    
+    try:
+        with conn.cursor() as cur:
+            if len(oligos) > OLIGO_COPY_THRESHOLD:
+                buf = io.StringIO(''.join(f"{file_id}\t{idx}\t{oligo}\n" for idx, oligo in enumerate(oligos)))
+                cur.copy_from(buf, 'dna_oligos', columns=('file_id', 'sequence_index', 'sequence'))
+            else:
+                psycopg2.extras.execute_values(
+                    cur,
+                    "INSERT INTO dna_oligos (file_id, sequence_index, sequence) VALUES %s",
+                    [(file_id, idx, oligo) for idx, oligo in enumerate(oligos)],
+                    page_size=OLIGO_INSERT_PAGE_SIZE
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def move_to_dead_letter(file_path: str, error_msg: str, context: dict) -> str:
@@ -301,14 +465,42 @@ def move_to_dead_letter(file_path: str, error_msg: str, context: dict) -> str:
     return dead_letter_path
 
 
+def migrate_schema(hook) -> None:
+    """Migrations idempotentes du schéma (init-scripts.sql ne s'exécute que sur une base vide)"""
+    # file_hash: VARCHAR(32) (MD5 brut) → VARCHAR(80) pour les hash '<algo>:<hexdigest>'
+    # (élargir un VARCHAR ne réécrit pas la table)
+    length_sql = """
+        SELECT character_maximum_length FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'processed_files' AND column_name = 'file_hash'
+    """
+    row = hook.get_first(length_sql)
+    if row and row[0] is not None and row[0] < 80:
+        hook.run("ALTER TABLE processed_files ALTER COLUMN file_hash TYPE VARCHAR(80)")
+        logger.info(f"Migration: processed_files.file_hash VARCHAR({row[0]}) → VARCHAR(80)")
+    
+    # Index redondants avec ceux des contraintes UNIQUE (file_hash, (file_id, sequence_index)):
+    # ne font que ralentir les écritures
+    hook.run([
+        "DROP INDEX IF EXISTS idx_processed_files_hash",
+        "DROP INDEX IF EXISTS idx_dna_oligos_file_id",
+    ])
+    
+    # Statistiques de requêtes pour log_pg_stats (facultatif: droits ou preload manquants)
+    try:
+        hook.run("CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+    except Exception as e:
+        logger.warning(f"Extension pg_stat_statements non créée: {e}")
+
+
 def check_database_connection(**context):
     """Vérifie connexion DB"""
-    initialize_components()
+    circuit_breaker, _ = get_components()
+    
+    # Un circuit ouvert n'est pas un échec de la DB: ne pas le compter
+    if not circuit_breaker.can_execute():
+        raise Exception("Circuit breaker ouvert")
     
     try:
-        if not circuit_breaker.can_execute():
-            raise Exception("Circuit breaker ouvert")
-        
         hook = PostgresHook(postgres_conn_id='postgres_default')
         
         check_table_sql = """
@@ -321,6 +513,7 @@ def check_database_connection(**context):
         
         if result[0] > 0:
             logger.info("Table processed_files trouvée")
+            migrate_schema(hook)
             return {'status': 'ready'}
         else:
             logger.warning("Table processed_files non trouvée")
@@ -333,13 +526,13 @@ def check_database_connection(**context):
 
 
 def check_files_and_trigger(**context):
-    """Vérifie présence de fichiers (tous types)"""
+    """Vérifie présence de fichiers (tous types), False court-circuite les tâches suivantes"""
     input_dir = get_input_dir()
     os.makedirs(input_dir, exist_ok=True)
     
     # Lister tous les fichiers (pas seulement .txt)
-    all_files = [f for f in os.listdir(input_dir) 
-                 if os.path.isfile(os.path.join(input_dir, f))]
+    with os.scandir(input_dir) as it:
+        all_files = [entry.name for entry in it if entry.is_file()]
     
     if not all_files:
         # Créer fichier de test
@@ -350,45 +543,165 @@ def check_files_and_trigger(**context):
     else:
         logger.info(f"{len(all_files)} fichiers trouvés")
     
-    return {'files_found': len(all_files) > 0}
+    return len(all_files) > 0
 
 
 def get_unprocessed_files(**context):
     """Récupère fichiers non traités (tous types)"""
     input_dir = get_input_dir()
-    hook = PostgresHook(postgres_conn_id='postgres_default')
+    
+    # Ignorer les répertoires (type fourni par scandir, sans stat supplémentaire)
+    with os.scandir(input_dir) as it:
+        entries = [entry for entry in it if entry.is_file()]
+    
+    def _hash_entry(entry):
+        # Calculer hash et taille en une seule ouverture (lecture binaire pour tous types)
+        file_hash, file_size = compute_file_hash(entry.path)
+        return {
+            'file_path': entry.path,
+            'file_hash': file_hash,
+            'file_size': file_size,
+            'filename': entry.name
+        }
+    
+    if len(entries) > 1:
+        with ThreadPoolExecutor(max_workers=min(HASH_MAX_WORKERS, len(entries))) as executor:
+            candidates = list(executor.map(_hash_entry, entries))
+    else:
+        candidates = [_hash_entry(entry) for entry in entries]
+    
+    # Vérifier en une seule requête lesquels sont déjà traités (une connexion pour toute la tâche)
+    existing = set()
+    if candidates:
+        conn = get_db_connection()
+        try:
+            check_sql = "SELECT file_hash FROM processed_files WHERE file_hash = ANY(%s::text[])"
+            with conn.cursor() as cur:
+                cur.execute(check_sql, [[c['file_hash'] for c in candidates]])
+                existing = {r[0] for r in cur.fetchall()}
+            existing |= match_legacy_hashes(conn, [c for c in candidates if c['file_hash'] not in existing])
+        finally:
+            conn.close()
     
     all_files = []
-    for file in os.listdir(input_dir):
-        file_path = os.path.join(input_dir, file)
-        
-        # Ignorer les répertoires
-        if not os.path.isfile(file_path):
+    for candidate in candidates:
+        if candidate['file_hash'] in existing:
             continue
-        
-        # Calculer hash et taille (lecture binaire pour tous types)
-        with open(file_path, 'rb') as f:
-            file_hash = hashlib.md5(f.read()).hexdigest()
-            file_size = os.path.getsize(file_path)
-        
-        # Vérifier si déjà traité
-        check_sql = "SELECT COUNT(*) FROM processed_files WHERE file_hash = %s"
-        if hook.get_first(check_sql, parameters=[file_hash])[0] == 0:
-            all_files.append({
-                'file_path': file_path,
-                'file_hash': file_hash,
-                'file_size': file_size,
-                'filename': file
-            })
-            logger.info(f"Nouveau: {file} (hash: {file_hash[:8]}...)")
+        all_files.append(candidate)
+        logger.info(f"Nouveau: {candidate['filename']} (hash: {short_hash(candidate['file_hash'])}...)")
+    
+    # Liste écrite sur disque: seul le chemin transite par XCom (metadata DB)
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    list_path = os.path.join(TEMP_DIR, f"unprocessed_{context['run_id']}.json")
+    with open(list_path, 'w') as f:
+        json.dump(all_files, f)
     
-    context['task_instance'].xcom_push(key='unprocessed_files', value=all_files)
+    context['task_instance'].xcom_push(key='unprocessed_files_path', value=list_path)
     return {'count': len(all_files)}
 
 
-def process_single_file(file_info, **context):
+def match_legacy_hashes(conn, candidates) -> set:
+    """Retrouve les candidats déjà traités sous un ancien hash MD5 (sans préfixe) et migre leur entrée"""
+    if not candidates:
+        return set()
+    legacy_sql = "SELECT EXISTS (SELECT 1 FROM processed_files WHERE position(':' in file_hash) = 0)"
+    with conn.cursor() as cur:
+        cur.execute(legacy_sql)
+        has_legacy = cur.fetchone()[0]
+    if not has_legacy:
+        return set()
+    
+    def _md5(candidate):
+        with open(candidate['file_path'], 'rb', buffering=0) as f:
+            return hashlib.file_digest(f, 'md5').hexdigest()
+    
+    with ThreadPoolExecutor(max_workers=min(HASH_MAX_WORKERS, len(candidates))) as executor:
+        md5s = list(executor.map(_md5, candidates))
+    
+    check_sql = "SELECT file_hash FROM processed_files WHERE file_hash = ANY(%s::text[])"
+    with conn.cursor() as cur:
+        cur.execute(check_sql, [md5s])
+        legacy = {r[0] for r in cur.fetchall()}
+    if not legacy:
+        return set()
+    
+    # Réécrire les entrées MD5 retrouvées avec le hash préfixé (les exécutions suivantes
+    # n'ont plus besoin de recalculer le MD5)
+    matched = [(c['file_hash'], md5) for c, md5 in zip(candidates, md5s) if md5 in legacy]
+    backfill_sql = """
+        UPDATE processed_files SET file_hash = %s
+        WHERE file_hash = %s
+          AND NOT EXISTS (SELECT 1 FROM processed_files WHERE file_hash = %s)
+    """
+    try:
+        with conn.cursor() as cur:
+            for new_hash, md5 in matched:
+                cur.execute(backfill_sql, [new_hash, md5, new_hash])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    logger.info(f"{len(matched)} fichiers déjà traités retrouvés par leur MD5 (entrées migrées)")
+    return {new_hash for new_hash, _ in matched}
+
+
+def process_single_file(file_info, config: dict = None, conn=None, **context):
     """Traite un fichier en oligos ADN"""
-    initialize_components()
+    if config is None:
+        config = get_config_variables()
+    
+    # Connexion fournie par l'appelant ou ouverte pour ce fichier
+    own_conn = conn is None
+    if own_conn:
+        try:
+            conn = get_db_connection()
+        except Exception as e:
+            return connection_failed_result(file_info, e)
+    
+    try:
+        return _process_file(file_info, config, conn, **context)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def connection_failed_result(file_info, error) -> dict:
+    """Résultat d'un fichier non traité faute de connexion (le fichier reste dans input/)"""
+    error_msg = f"Erreur: {file_info['filename']}: connexion Postgres impossible: {error}"
+    logger.error(error_msg)
+    return {'filename': file_info['filename'], 'status': 'failed', 'error': error_msg, 'db_error': True}
+
+
+# Connexion Postgres d'un process du pool (une par worker, ouverte par l'initializer)
+_worker_conn = None
+
+
+def _init_worker_connection():
+    """Initializer du ProcessPoolExecutor: ouvre la connexion du worker"""
+    global _worker_conn
+    try:
+        _worker_conn = get_db_connection()
+    except Exception as e:
+        # Réessayée au premier fichier (voir _process_file_in_worker)
+        logger.error(f"Connexion Postgres du worker impossible: {e}")
+        _worker_conn = None
+
+
+def _process_file_in_worker(file_info, config: dict):
+    """Traite un fichier dans un worker du pool, sur la connexion du worker"""
+    global _worker_conn
+    if _worker_conn is None or _worker_conn.closed:
+        try:
+            _worker_conn = get_db_connection()
+        except Exception as e:
+            return connection_failed_result(file_info, e)
+    return process_single_file(file_info, config=config, conn=_worker_conn)
+
+
+def _process_file(file_info, config: dict, conn, **context):
+    """Corps de process_single_file sur une connexion ouverte"""
+    circuit_breaker, retry_manager = get_components()
     
     file_path = file_info['file_path']
     file_hash = file_info['file_hash']
@@ -401,20 +714,13 @@ def process_single_file(file_info, **context):
         if not circuit_breaker.can_execute():
             raise Exception("Circuit breaker ouvert")
         
-        update_file_status(file_hash, 'processing', file_path=file_path, file_size=file_size, **context)
+        file_id = update_file_status(conn, file_hash, 'processing', file_path=file_path, file_size=file_size, **context)
+        if file_id is None:
+            raise DatabaseUnavailableError(f"Impossible d'enregistrer le fichier dans processed_files: {file_hash}")
         
         def _process_with_retry():
-            # Récupérer configuration
-            config = get_config_variables()
-            
-            # Créer encodeur
-            dna_storage = DNAStorage(
-                chunk_size=config['chunk_size'],
-                redundancy=3,
-                error_correction=config['error_correction_symbols'],
-                segment_nt=120,
-                reseed_attempts=4
-            )
+            # Encodeur partagé (une instance par configuration et par process)
+            dna_storage = get_encoder(config['chunk_size'], config['error_correction_symbols'])
             
             # Encoder en oligos
             logger.info("Encodage en oligos ADN...")
@@ -422,44 +728,28 @@ def process_single_file(file_info, **context):
             
             logger.info(f"{len(oligos)} oligos générés")
             
-            # Sauvegarder en DB
-            hook = PostgresHook(postgres_conn_id='postgres_default')
-            
-            # Récupérer l'ID du fichier depuis processed_files
-            file_id_sql = "SELECT id FROM processed_files WHERE file_hash = %s"
-            file_id_result = hook.get_first(file_id_sql, parameters=[file_hash])
-            
-            if not file_id_result:
-                raise ValueError(f"Fichier non trouvé dans processed_files: {file_hash}")
-            
-            file_id = file_id_result[0]
-            
-            # Insérer oligos en batch (tous en une fois)
-            # Utiliser ON CONFLICT pour éviter les doublons
-            if oligos:
-                values = [(file_id, idx, oligo) for idx, oligo in enumerate(oligos)]
-                hook.insert_rows(
-                    table='dna_oligos',
-                    rows=values,
-                    target_fields=['file_id', 'sequence_index', 'sequence'],
-                    replace=False
-                )
+            # Insérer oligos en batch (une seule transaction)
+            insert_oligos(conn, file_id, oligos)
             
             # Sauvegarder fichier FASTA
             output_file = os.path.join(OUTPUT_DIR, f"oligos_{filename}.fasta")
             os.makedirs(OUTPUT_DIR, exist_ok=True)
             
+            # Un seul buffer, une seule écriture
+            fasta = ''.join([f">oligo_{idx}\n{oligo}\n" for idx, oligo in enumerate(oligos)])
             with open(output_file, 'w') as f:
-                for idx, oligo in enumerate(oligos):
-                    f.write(f">oligo_{idx}\n{oligo}\n")
+                f.write(fasta)
             
             logger.info(f"{len(oligos)} oligos sauvegardés en DB")
             
-            update_file_status(file_hash, 'completed', **context)
+            update_file_status(conn, file_hash, 'completed', **context)
             
             return {
                 'filename': filename,
+                'file_id': file_id,
                 'file_hash': file_hash,
+                'file_path': file_path,
+                'file_size': file_size,
                 'num_oligos': len(oligos),
                 'output_file': output_file,
                 'status': 'completed'
@@ -472,183 +762,219 @@ def process_single_file(file_info, **context):
         return result
         
     except Exception as e:
-        circuit_breaker.record_failure()
+        # Fichier invalide/illisible: échec propre au fichier, la base reste saine
+        db_error = isinstance(e, DB_ERRORS)
+        if db_error:
+            circuit_breaker.record_failure()
         error_msg = f"Erreur: {filename}: {str(e)}"
         logger.error(error_msg)
         
-        update_file_status(file_hash, 'failed', **context)
+        update_file_status(conn, file_hash, 'failed', **context)
         move_to_dead_letter(file_path, error_msg, context)
         
-        return {'filename': filename, 'status': 'failed', 'error': error_msg}
+        return {'filename': filename, 'status': 'failed', 'error': error_msg, 'db_error': db_error}
+
+
+def remove_handoff_file(path: str) -> None:
+    """Supprime un fichier de passage entre tâches (absent: rien à faire)"""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 
 def process_all_files(**context):
     """Traite tous les fichiers"""
-    initialize_components()
+    circuit_breaker, _ = get_components()
     
-    unprocessed = context['task_instance'].xcom_pull(
+    list_path = context['task_instance'].xcom_pull(
         task_ids='get_unprocessed_files',
-        key='unprocessed_files'
+        key='unprocessed_files_path'
     )
     
+    unprocessed = []
+    if list_path:
+        # Absent alors que get_unprocessed_files l'a publié: ne pas conclure "rien à traiter"
+        if not os.path.exists(list_path):
+            raise FileNotFoundError(f"Liste des fichiers non traités introuvable: {list_path}")
+        with open(list_path) as f:
+            unprocessed = json.load(f)
+    
     if not unprocessed:
+        remove_handoff_file(list_path)
         return {'processed_count': 0}
     
-    results = []
-    for file_info in unprocessed:
-        result = process_single_file(file_info, **context)
-        results.append(result)
+    # Configuration résolue une seule fois pour tout le lot
+    config = get_config_variables()
+    
+    # Encodage CPU-bound: un process par fichier (le contexte Airflow n'est pas picklable,
+    # chaque worker reçoit seulement file_info et la config)
+    max_workers = min(len(unprocessed), os.cpu_count() or 1)
+    if max_workers > 1:
+        worker = functools.partial(_process_file_in_worker, config=config)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker_connection) as executor:
+            results = list(executor.map(worker, unprocessed))
+        
+        # Breakers locaux aux workers: agréger les résultats ici (Redis est déjà partagé)
+        if not isinstance(circuit_breaker, RedisCircuitBreaker):
+            for r in results:
+                if r.get('db_error'):
+                    circuit_breaker.record_failure()
+                elif r.get('status') != 'failed':
+                    circuit_breaker.record_success()
+    else:
+        conn = get_db_connection()
+        try:
+            results = [process_single_file(file_info, config=config, conn=conn, **context)
+                       for file_info in unprocessed]
+        finally:
+            conn.close()
     
-    logger.info(f"Traitement terminé: {len(results)} fichiers")
+    # Supprimée seulement une fois le lot traité (un retry de la tâche la relit)
+    remove_handoff_file(list_path)
+    
+    failed_count = sum(1 for r in results if r.get('status') == 'failed')
+    logger.info(f"Traitement terminé: {len(results)} fichiers ({failed_count} échecs, {max_workers} workers)")
     
     # Stocker les résultats pour la vérification
     context['task_instance'].xcom_push(key='processed_results', value=results)
     
-    return {'processed_count': len(results), 'results': results}
+    return {'processed_count': len(results)}
 
 
 def verify_reconstruction(**context):
     """Vérifie la reconstruction des fichiers depuis les oligos ADN"""
-    initialize_components()
-    
-    # Récupérer les résultats du traitement précédent
-    process_result = context['task_instance'].xcom_pull(
-        task_ids='process_all_files'
-    )
-    
-    # Vérifier si des fichiers ont été traités
-    if not process_result or process_result.get('processed_count', 0) == 0:
-        logger.info("Aucun fichier traité dans cette exécution - vérification ignorée")
-        return {'verified_count': 0, 'skipped': True}
-    
+    # Récupérer les résultats du traitement précédent (contiennent déjà id, hash, chemin, taille)
     processed_results = context['task_instance'].xcom_pull(
         task_ids='process_all_files',
         key='processed_results'
     )
     
+    # Vérifier si des fichiers ont été traités
     if not processed_results:
-        logger.info("Aucun résultat de traitement trouvé - vérification ignorée")
+        logger.info("Aucun fichier traité dans cette exécution - vérification ignorée")
         return {'verified_count': 0, 'skipped': True}
     
     # Utiliser les fichiers traités dans cette exécution
-    file_hashes_to_check = [r.get('file_hash') for r in processed_results if r.get('status') == 'completed']
+    completed_files = [
+        (r['file_id'], r['file_hash'], r['file_path'], r['file_size'])
+        for r in processed_results if r.get('status') == 'completed'
+    ]
     
-    if not file_hashes_to_check:
+    if not completed_files:
         logger.info("Aucun fichier complété à vérifier dans cette exécution")
         return {'verified_count': 0, 'skipped': False}
     
-    hook = PostgresHook(postgres_conn_id='postgres_default')
-    
     # Récupérer configuration
     config = get_config_variables()
     
-    dna_storage = DNAStorage(
-        chunk_size=config['chunk_size'],
-        redundancy=3,
-        error_correction=config['error_correction_symbols'],
-        segment_nt=120,
-        reseed_attempts=4
-    )
-    
-    # Récupérer les infos complètes depuis la DB
-    placeholders = ','.join(['%s'] * len(file_hashes_to_check))
-    completed_files_sql = f"""
-        SELECT id, file_hash, file_path, file_size 
-        FROM processed_files 
-        WHERE file_hash IN ({placeholders})
-    """
-    completed_files = hook.get_records(completed_files_sql, parameters=file_hashes_to_check)
-    
-    if not completed_files:
-        logger.info("Aucun fichier complété à vérifier")
-        return {'verified_count': 0, 'skipped': False}
+    dna_storage = get_encoder(config['chunk_size'], config['error_correction_symbols'])
     
     logger.info(f"Vérification de {len(completed_files)} fichiers...")
     
-    verification_results = []
-    
-    for file_id, file_hash, file_path, file_size in completed_files:
-        try:
-            # Récupérer tous les oligos pour ce fichier
-            oligos_sql = """
-                SELECT sequence_index, sequence 
-                FROM dna_oligos 
-                WHERE file_id = %s 
-                ORDER BY sequence_index
-            """
-            oligos_records = hook.get_records(oligos_sql, parameters=[file_id])
-            
-            if not oligos_records:
-                logger.warning(f"Aucun oligo trouvé pour file_id={file_id}")
-                continue
-            
-            # Extraire les séquences ADN
-            sequences = [seq for _, seq in oligos_records]
-            logger.info(f"{len(sequences)} oligos récupérés pour {file_path}")
-            
-            # Reconstruire le fichier
-            logger.info(f"Reconstruction du fichier...")
-            success, reconstructed_bytes = dna_storage.decode_sequences(sequences)
-            
-            if not success:
-                logger.error(f"Échec de reconstruction pour {file_path}")
-                verification_results.append({
-                    'file_id': file_id,
-                    'file_path': file_path,
-                    'file_hash': file_hash,
-                    'status': 'reconstruction_failed',
-                    'error': 'decode_sequences returned False'
-                })
-                continue
-            
-            # Calculer le hash du fichier reconstruit
-            reconstructed_hash = hashlib.md5(reconstructed_bytes).hexdigest()
-            
-            # Comparer avec le hash original
-            if reconstructed_hash == file_hash:
-                logger.info(f"Vérification OK: {file_path} (hash: {file_hash[:8]}...)")
-                verification_results.append({
-                    'file_id': file_id,
-                    'file_path': file_path,
-                    'file_hash': file_hash,
-                    'reconstructed_hash': reconstructed_hash,
-                    'status': 'verified',
-                    'file_size': file_size,
-                    'reconstructed_size': len(reconstructed_bytes),
-                    'num_oligos': len(sequences)
-                })
+    # Une seule connexion pour toute la vérification
+    conn = get_db_connection()
+    try:
+        # Récupérer les oligos de tous les fichiers en une requête, groupés par file_id
+        oligos_sql = """
+            SELECT file_id, sequence_index, sequence 
+            FROM dna_oligos 
+            WHERE file_id = ANY(%s) 
+            ORDER BY file_id, sequence_index
+        """
+        with conn.cursor() as cur:
+            cur.execute(oligos_sql, [[row[0] for row in completed_files]])
+            oligos_records = cur.fetchall()
+        sequences_by_file = {
+            file_id: [seq for _, _, seq in rows]
+            for file_id, rows in itertools.groupby(oligos_records, key=operator.itemgetter(0))
+        }
+        
+        verification_results = []
+        verified_ids = []
+        
+        for file_id, file_hash, file_path, file_size in completed_files:
+            try:
+                # Extraire les séquences ADN
+                sequences = sequences_by_file.get(file_id)
+                if not sequences:
+                    logger.warning(f"Aucun oligo trouvé pour file_id={file_id}")
+                    continue
                 
-                # Mettre à jour le statut (optionnel: ajouter un champ verified)
-                update_sql = """
-                    UPDATE processed_files 
-                    SET status = 'verified'
-                    WHERE id = %s
-                """
-                hook.run(update_sql, parameters=[file_id])
-            else:
-                logger.error(f"Hash mismatch pour {file_path}")
-                logger.error(f"   Original: {file_hash}")
-                logger.error(f"   Reconstruit: {reconstructed_hash}")
+                logger.info(f"{len(sequences)} oligos récupérés pour {file_path}")
+                
+                # Reconstruire le fichier
+                logger.info(f"Reconstruction du fichier...")
+                success, reconstructed_bytes = dna_storage.decode_sequences(sequences)
+                
+                if not success:
+                    logger.error(f"Échec de reconstruction pour {file_path}")
+                    verification_results.append({
+                        'file_id': file_id,
+                        'file_path': file_path,
+                        'file_hash': file_hash,
+                        'status': 'reconstruction_failed',
+                        'error': 'decode_sequences returned False'
+                    })
+                    continue
+                
+                # Calculer le hash du fichier reconstruit
+                reconstructed_hash = compute_bytes_hash(reconstructed_bytes, file_hash)
+                
+                # Comparer avec le hash original
+                if reconstructed_hash == file_hash:
+                    logger.info(f"Vérification OK: {file_path} (hash: {short_hash(file_hash)}...)")
+                    verification_results.append({
+                        'file_id': file_id,
+                        'file_path': file_path,
+                        'file_hash': file_hash,
+                        'reconstructed_hash': reconstructed_hash,
+                        'status': 'verified',
+                        'file_size': file_size,
+                        'reconstructed_size': len(reconstructed_bytes),
+                        'num_oligos': len(sequences)
+                    })
+                    
+                    verified_ids.append(file_id)
+                else:
+                    logger.error(f"Hash mismatch pour {file_path}")
+                    logger.error(f"   Original: {file_hash}")
+                    logger.error(f"   Reconstruit: {reconstructed_hash}")
+                    verification_results.append({
+                        'file_id': file_id,
+                        'file_path': file_path,
+                        'file_hash': file_hash,
+                        'reconstructed_hash': reconstructed_hash,
+                        'status': 'hash_mismatch',
+                        'file_size': file_size,
+                        'reconstructed_size': len(reconstructed_bytes),
+                        'num_oligos': len(sequences)
+                    })
+                    
+            except Exception as e:
+                logger.error(f"Erreur lors de la vérification de {file_path}: {e}")
                 verification_results.append({
                     'file_id': file_id,
                     'file_path': file_path,
                     'file_hash': file_hash,
-                    'reconstructed_hash': reconstructed_hash,
-                    'status': 'hash_mismatch',
-                    'file_size': file_size,
-                    'reconstructed_size': len(reconstructed_bytes),
-                    'num_oligos': len(sequences)
+                    'status': 'verification_error',
+                    'error': str(e)
                 })
-                
-        except Exception as e:
-            logger.error(f"Erreur lors de la vérification de {file_path}: {e}")
-            verification_results.append({
-                'file_id': file_id,
-                'file_path': file_path,
-                'file_hash': file_hash,
-                'status': 'verification_error',
-                'error': str(e)
-            })
+        
+        # Mettre à jour le statut des fichiers vérifiés en une requête
+        if verified_ids:
+            update_sql = """
+                UPDATE processed_files 
+                SET status = 'verified'
+                WHERE id = ANY(%s)
+            """
+            with conn.cursor() as cur:
+                cur.execute(update_sql, [verified_ids])
+            conn.commit()
+    finally:
+        conn.close()
     
     verified_count = sum(1 for r in verification_results if r['status'] == 'verified')
     logger.info(f"Vérification terminée: {verified_count}/{len(verification_results)} fichiers vérifiés avec succès")
@@ -660,6 +986,28 @@ def verify_reconstruction(**context):
     }
 
 
+def log_pg_stats(**context):
+    """Journalise les requêtes les plus coûteuses du pipeline (pg_stat_statements)"""
+    stats_sql = """
+        SELECT queryid, calls, total_exec_time, mean_exec_time, left(query, 120)
+        FROM pg_stat_statements
+        WHERE query ILIKE '%%processed_files%%' OR query ILIKE '%%dna_oligos%%'
+        ORDER BY total_exec_time DESC
+        LIMIT 20
+    """
+    try:
+        records = PostgresHook(postgres_conn_id='postgres_default').get_records(stats_sql)
+    except Exception as e:
+        # Extension absente ou non préchargée: diagnostic seulement, ne pas faire échouer le DAG
+        logger.warning(f"pg_stat_statements indisponible: {e}")
+        return {'queries': 0}
+    
+    for queryid, calls, total_ms, mean_ms, query in records:
+        logger.info(f"[pg_stats] {queryid}: {calls} appels, total {total_ms:.1f} ms, moyen {mean_ms:.2f} ms - {query}")
+    
+    return {'queries': len(records)}
+
+
 # Création du DAG
 dag = DAG(
     'dna_oligos_pipeline',
@@ -673,7 +1021,7 @@ dag = DAG(
 # Tâches
 task_setup_vars = PythonOperator(
     task_id='setup_airflow_variables',
-    python_callable=lambda: Variable.set('input_directory', DEFAULT_INPUT_DIR),
+    python_callable=seed_pipeline_config,
     dag=dag,
 )
 
@@ -683,7 +1031,7 @@ task_check_db = PythonOperator(
     dag=dag,
 )
 
-task_check_files = PythonOperator(
+task_check_files = ShortCircuitOperator(
     task_id='check_files_and_trigger',
     python_callable=check_files_and_trigger,
     dag=dag,
@@ -707,6 +1055,13 @@ task_verify_reconstruction = PythonOperator(
     dag=dag,
 )
 
+task_log_pg_stats = PythonOperator(
+    task_id='log_pg_stats',
+    python_callable=log_pg_stats,
+    trigger_rule=TriggerRule.ALL_DONE,
+    dag=dag,
+)
+
 # Dépendances
-task_setup_vars >> task_check_db >> task_check_files >> task_get_unprocessed >> task_process_all >> task_verify_reconstruction
+task_setup_vars >> task_check_db >> task_check_files >> task_get_unprocessed >> task_process_all >> task_verify_reconstruction >> task_log_pg_stats
 
@@ -1,10 +1,14 @@
 -- Initialisation de la base de données Airflow
 -- (Ces commandes sont déjà exécutées par les variables d'environnement Docker)
 
+-- Statistiques de requêtes (tâche log_pg_stats du DAG, nécessite shared_preload_libraries)
+-- Bases existantes: créée par migrate_schema dans le DAG
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
+
 -- Création de la table pour tracker les fichiers traités
 CREATE TABLE IF NOT EXISTS processed_files (
     id SERIAL PRIMARY KEY,
-    file_hash VARCHAR(32) UNIQUE NOT NULL,
+    file_hash VARCHAR(80) UNIQUE NOT NULL,
     file_path VARCHAR(500) NOT NULL,
     file_size BIGINT NOT NULL,
     processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -13,15 +17,20 @@ CREATE TABLE IF NOT EXISTS processed_files (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Les bases existantes (file_hash VARCHAR(32)) sont migrées par migrate_schema dans le DAG:
+-- ce script ne s'exécute que sur un volume de données vide
+
 -- Création des index pour optimiser les performances
-CREATE INDEX IF NOT EXISTS idx_processed_files_hash ON processed_files(file_hash);
+-- Les recherches par file_hash utilisent l'index de la contrainte UNIQUE (processed_files_file_hash_key);
+-- un second index sur la même colonne ne ferait que ralentir les écritures
+-- (les index redondants des bases existantes sont supprimés par migrate_schema dans le DAG)
 CREATE INDEX IF NOT EXISTS idx_processed_files_path ON processed_files(file_path);
 CREATE INDEX IF NOT EXISTS idx_processed_files_status ON processed_files(status);
 CREATE INDEX IF NOT EXISTS idx_processed_files_processed_at ON processed_files(processed_at);
 
 -- Commentaire sur la table
 COMMENT ON TABLE processed_files IS 'Table de tracking des fichiers traités par le pipeline';
-COMMENT ON COLUMN processed_files.file_hash IS 'Hash MD5 unique du fichier pour éviter les doublons';
+COMMENT ON COLUMN processed_files.file_hash IS 'Hash unique du fichier (''<algo>:<hexdigest>'', MD5 brut pour les anciennes entrées) pour éviter les doublons';
 COMMENT ON COLUMN processed_files.file_path IS 'Chemin original du fichier traité';
 COMMENT ON COLUMN processed_files.status IS 'Statut du traitement: pending, processing, completed, verified, failed';
 
@@ -41,7 +50,8 @@ CREATE TABLE IF NOT EXISTS dna_oligos (
 );
 
 -- Index pour optimiser les requêtes
-CREATE INDEX IF NOT EXISTS idx_dna_oligos_file_id ON dna_oligos(file_id);
+-- WHERE file_id = ANY(...) ORDER BY file_id, sequence_index est servi sans tri par l'index
+-- de la contrainte UNIQUE(file_id, sequence_index) (dna_oligos_file_id_sequence_index_key)
 CREATE INDEX IF NOT EXISTS idx_dna_oligos_sequence_index ON dna_oligos(sequence_index);
 CREATE INDEX IF NOT EXISTS idx_dna_oligos_chunk_idx ON dna_oligos(chunk_idx);
 CREATE INDEX IF NOT EXISTS idx_dna_oligos_seq_type ON dna_oligos(seq_type);
@@ -19,7 +19,7 @@ from .functions.converts import (
     GOLDMAN_DECODE,
 )
 
-from .functions.crc import crc8, crc16_ccitt
+from .functions.crc import crc8, crc16_ccitt, crc32c
 from .functions.constraints import gc_content, max_run_length, passes_constraints
 from .functions.consensus import consensus
 
@@ -39,6 +39,7 @@ __all__ = [
     # CRC
     'crc8',
     'crc16_ccitt',
+    'crc32c',
     # Contraintes
     'gc_content',
     'max_run_length',
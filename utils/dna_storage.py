@@ -2,7 +2,7 @@
 Système de stockage sur ADN auto-suffisant.
 - Préfixe robuste (80 bases) avec CRC-8
 - Support jusqu'à 16M chunks avec 1K séquences par chunk
-- CRC-32 par chunk (avant RS) pour détecter les faux positifs de décodage
+- CRC-32 (ou CRC-32C matériel) par chunk (avant RS) pour détecter les faux positifs de décodage
 - Respect des limites Reed-Solomon GF(256) : longueur code ≤ 255
 - Encodage Goldman (sans homopolymères), re-seeding simple pour contraintes GC/run
 - Consensus sur réplicats
@@ -10,37 +10,53 @@ Système de stockage sur ADN auto-suffisant.
 
 from __future__ import annotations
 import hashlib
+import os
+import re
 import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from typing import List, Tuple, Optional
-from collections import Counter
 try:
     # Essayer import absolu (depuis utils package)
-    from .functions.converts import bytes_to_bits, bits_to_bytes
-    from .functions.crc import crc8
-    from .functions.constraints import passes_constraints
+    from .functions.crc import crc8, crc16_ccitt, crc32c
+    from .functions.constraints import GC_MIN, GC_MAX
+    from .functions.consensus import consensus
     from .functions.converts import bytes_to_dna_goldman, dna_to_bytes_goldman
 except ImportError:
     # Fallback: essayer import depuis airf low
     try:
-        from utils.functions.converts import bytes_to_bits, bits_to_bytes
-        from utils.functions.crc import crc8
-        from utils.functions.constraints import passes_constraints
+        from utils.functions.crc import crc8, crc16_ccitt, crc32c
+        from utils.functions.constraints import GC_MIN, GC_MAX
+        from utils.functions.consensus import consensus
         from utils.functions.converts import bytes_to_dna_goldman, dna_to_bytes_goldman
     except ImportError:
         # Dernier fallback: import direct si dans le même dir
         import sys
-        import os
         # Ajouter le répertoire parent
         sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-        from utils.functions.converts import bytes_to_bits, bits_to_bytes
-        from utils.functions.crc import crc8
-        from utils.functions.constraints import passes_constraints
+        from utils.functions.crc import crc8, crc16_ccitt, crc32c
+        from utils.functions.constraints import GC_MIN, GC_MAX
+        from utils.functions.consensus import consensus
         from utils.functions.converts import bytes_to_dna_goldman, dna_to_bytes_goldman
 
 try:
-    from reedsolo import RSCodec
+    # Extension C de reedsolo (optionnelle, bien plus rapide)
+    from creedsolo import RSCodec
 except ImportError:
-    raise ImportError("Installation requise: pip install reedsolo")
+    try:
+        from reedsolo import RSCodec
+    except ImportError:
+        raise ImportError("Installation requise: pip install reedsolo")
+
+try:
+    # CRC-32C en C, optionnel: pip install crc32c (instruction matérielle SSE 4.2 / ARMv8
+    # si le CPU la fournit, sinon implémentation logicielle du paquet)
+    import crc32c as _crc32c_pkg
+    _crc32c_c = _crc32c_pkg.crc32c
+    _CRC32C_HARDWARE = bool(getattr(_crc32c_pkg, 'hardware_based', False))
+except ImportError:
+    _crc32c_c = None
+    _CRC32C_HARDWARE = False
 
 
 
@@ -65,7 +81,8 @@ class DNAStorage:
                  error_correction: int = 10,     # nsym RS (symboles de parité)
                  segment_nt: int = 120,          # longueur d'un segment ADN (payload nt par séquence)
                  prefix_len: int = 80,           # long. préfixe (fixe: 80)
-                 reseed_attempts: int = 4):      # essais de re-seed (bases de départ)
+                 reseed_attempts: int = 4,       # essais de re-seed (bases de départ)
+                 workers: int = 1):              # processus d'encodage (1 = séquentiel, None = nb de CPU)
         # RS constraint: codeword_len = (chunk + CRC32 4B) + nsym ≤ 255
         if chunk_size + 4 + error_correction > 255:
             raise ValueError(
@@ -77,6 +94,22 @@ class DNAStorage:
         self.segment_nt = segment_nt
         self.prefix_len = prefix_len
         self.reseed_attempts = reseed_attempts
+        self.workers = workers or os.cpu_count() or 1
+        # CRC-32C seulement si l'instruction matérielle est disponible (sinon zlib, plus rapide en logiciel)
+        self.chunk_crc = self.CHUNK_CRC_CRC32C if _CRC32C_HARDWARE else self.CHUNK_CRC_ZLIB
+        # Codecs RS par nsym (le générateur polynomial n'est construit qu'une fois)
+        self._rs_codecs = {error_correction: RSCodec(error_correction)}
+
+    def _rs(self, nsym: int) -> RSCodec:
+        rs = self._rs_codecs.get(nsym)
+        if rs is None:
+            rs = self._rs_codecs[nsym] = RSCodec(nsym)
+        return rs
+
+    def _config(self) -> tuple:
+        # paramètres de reconstruction de l'encodeur dans un processus worker
+        return (self.chunk_size, self.redundancy, self.error_correction,
+                self.segment_nt, self.prefix_len, self.reseed_attempts)
 
     # ---------- Préfixe (80 bases) ----------
     # Layout:
@@ -90,13 +123,22 @@ class DNAStorage:
     # Mapping binaire→base: 0→'T', 1→'C'
     # Longueur totale: 2 + 2 + 68 + 8 = 80 bases
 
+    # Tables de traduction (str.translate, une seule passe en C)
+    _BIN2CT = str.maketrans('01', 'TC')
+    _CT2BIN = str.maketrans('ACGT', '0100')  # A/G/T → 0, C → 1 (autres caractères: voir _ct_to_bin)
+    _DEL_ACGT = str.maketrans('', '', 'ACGT')
+    _NOT_C = re.compile(r'[^C]')
+
     @staticmethod
     def _bin_to_ct(bitstr: str) -> str:
-        return ''.join('C' if b == '1' else 'T' for b in bitstr)
+        return bitstr.translate(DNAStorage._BIN2CT)
 
     @staticmethod
     def _ct_to_bin(ct: str) -> str:
-        return ''.join('1' if b == 'C' else '0' for b in ct)
+        if ct.translate(DNAStorage._DEL_ACGT):
+            # caractère hors ACGT (N, minuscule, chiffre...): comme avant, tout ce qui n'est pas C vaut 0
+            return DNAStorage._NOT_C.sub('0', ct).replace('C', '1')
+        return ct.translate(DNAStorage._CT2BIN)
 
     def _create_prefix(self,
                        chunk_idx: int,
@@ -106,31 +148,43 @@ class DNAStorage:
                        total_seqs: int) -> str:
         if seq_type not in self.TYPE_CODE:
             raise ValueError("seq_type doit être 'H', 'D' ou 'P'.")
+        return self._prefix_builder(chunk_idx, total_chunks, total_seqs)(seq_type, seq_idx)
 
+    def _prefix_builder(self, chunk_idx: int, total_chunks: int, total_seqs: int):
+        """Constructeur de préfixes d'un chunk: champs constants et CRC partiel calculés une fois."""
         # bornes
         if not (0 <= chunk_idx < 2**24) or not (0 <= total_chunks < 2**24):
             raise ValueError("chunk_idx/total_chunks doivent tenir sur 24 bits (0..16777215).")
-        if not (0 <= seq_idx < 2**10) or not (0 <= total_seqs < 2**10):
+        if not (0 <= total_seqs < 2**10):
             raise ValueError("seq_idx/total_seqs doivent tenir sur 10 bits (0..1023).")
 
-        fields_bits = (
-            bytes_to_bits(chunk_idx, 24) +      # 24 bits = 16M chunks max
-            bytes_to_bits(total_chunks, 24) +    # 24 bits = 16M chunks max
-            bytes_to_bits(seq_idx, 10) +        # 10 bits = 1024 seqs/chunk max
-            bytes_to_bits(total_seqs, 10)        # 10 bits = 1024 seqs/chunk max
-        )
-        crc = crc8(bits_to_bytes(fields_bits))  # CRC-8 des 36 bits packés
-        crc_bits = bytes_to_bits(crc, 8)
-
-        prefix = []
-        prefix.append('AG')                                 # SYNC
-        prefix.append(self.TYPE_CODE[seq_type])             # TYPE
-        prefix.append(self._bin_to_ct(fields_bits))         # CHAMPS
-        prefix.append(self._bin_to_ct(crc_bits))            # CRC8
-
-        out = ''.join(prefix)
-        assert len(out) == 80
-        return out
+        # 68 bits packés: CHUNK_IDX(24) | TOTAL_CHUNKS(24) | SEQ_IDX(10) | TOTAL_SEQS(10)
+        # Les 48 premiers bits (6 octets) sont fixes pour le chunk: CRC-8 chaîné sur les 3 derniers
+        head = (chunk_idx << 24) | total_chunks
+        head_ct = self._bin_to_ct(format(head, '048b'))
+        total_ct = self._bin_to_ct(format(total_seqs, '010b'))
+        head_crc = crc8(head.to_bytes(6, 'big'))
+        type_code = self.TYPE_CODE
+
+        def build(seq_type: str, seq_idx: int) -> str:
+            if seq_type not in type_code:
+                raise ValueError("seq_type doit être 'H', 'D' ou 'P'.")
+            if not (0 <= seq_idx < 2**10):
+                raise ValueError("seq_idx/total_seqs doivent tenir sur 10 bits (0..1023).")
+            tail = ((seq_idx << 10) | total_seqs) << 4   # 20 bits complétés à 24
+            crc = crc8(tail.to_bytes(3, 'big'), init=head_crc)
+            out = ''.join((
+                'AG',                                       # SYNC
+                type_code[seq_type],                        # TYPE
+                head_ct,                                    # CHUNK_IDX + TOTAL_CHUNKS
+                self._bin_to_ct(format(seq_idx, '010b')),   # SEQ_IDX
+                total_ct,                                   # TOTAL_SEQS
+                self._bin_to_ct(format(crc, '08b')),        # CRC8
+            ))
+            assert len(out) == 80
+            return out
+
+        return build
 
     def _parse_prefix(self, sequence: str) -> Optional[dict]:
         if len(sequence) < 80:
@@ -145,17 +199,16 @@ class DNAStorage:
 
         fields_ct = sequence[4:4+68]
         crc_ct = sequence[72:80]
-        fields_bits = self._ct_to_bin(fields_ct)
-        crc_bits = self._ct_to_bin(crc_ct)
+        fields = int(self._ct_to_bin(fields_ct), 2)
+        crc_read = int(self._ct_to_bin(crc_ct), 2)
 
-        calc_crc = crc8(bits_to_bytes(fields_bits))
-        if bytes_to_bits(calc_crc, 8) != crc_bits:
+        if crc8((fields << 4).to_bytes(9, 'big')) != crc_read:
             return None  # CRC préfixe invalide
 
-        chunk_idx = int(fields_bits[0:24], 2)
-        total_chunks = int(fields_bits[24:48], 2)
-        seq_idx = int(fields_bits[48:58], 2)
-        total_seqs = int(fields_bits[58:68], 2)
+        chunk_idx = fields >> 44
+        total_chunks = (fields >> 20) & 0xFFFFFF
+        seq_idx = (fields >> 10) & 0x3FF
+        total_seqs = fields & 0x3FF
 
         return {
             'seq_type': seq_type,
@@ -171,38 +224,54 @@ class DNAStorage:
     #  - file_size: 8B
     #  - chunk_size: 2B
     #  - nsym (RS): 1B
-    #  - reserved: 1B
+    #  - version: 1B (ex-reserved)
+    #      bits 0-3: CRC du header (0 = CRC16-CCITT, 1 = CRC32 tronqué)
+    #      bits 4-7: CRC des chunks (0 = CRC-32 zlib, 1 = CRC-32C)
     #  - checksum SHA256 (tronc.) : 8B
-    #  - CRC16 sur les 20 premiers: 2B (CCITT)
+    #  - CRC16 sur les 20 premiers: 2B
     # total 22B
+    HEADER_VERSION_CCITT = 0
+    HEADER_VERSION_CRC32 = 1
+    CHUNK_CRC_ZLIB = 0
+    CHUNK_CRC_CRC32C = 1
 
     @staticmethod
     def _crc16_ccitt(data: bytes, poly=0x1021, init=0xFFFF) -> int:
-        crc = init
-        for b in data:
-            crc ^= (b << 8) & 0xFFFF
-            for _ in range(8):
-                if crc & 0x8000:
-                    crc = ((crc << 1) ^ poly) & 0xFFFF
-                else:
-                    crc = (crc << 1) & 0xFFFF
-        return crc & 0xFFFF
+        # table 256 entrées (functions/crc.py)
+        return crc16_ccitt(data, poly=poly, init=init)
+
+    def _header_crc(self, hdr20: bytes, version: int) -> int:
+        if version == self.HEADER_VERSION_CRC32:
+            # CRC32 (zlib, en C) tronqué aux 16 bits de poids faible
+            return zlib.crc32(hdr20) & 0xFFFF
+        if version == self.HEADER_VERSION_CCITT:
+            return self._crc16_ccitt(hdr20)
+        raise ValueError(f"Version de header inconnue: {version}")
+
+    @staticmethod
+    def _chunk_crc(data: bytes, algo: int) -> int:
+        if algo == DNAStorage.CHUNK_CRC_CRC32C:
+            # paquet crc32c (C) si installé, sinon table pur Python
+            return _crc32c_c(data) if _crc32c_c is not None else crc32c(data)
+        if algo == DNAStorage.CHUNK_CRC_ZLIB:
+            return zlib.crc32(data) & 0xFFFFFFFF
+        raise ValueError(f"Algorithme CRC de chunk inconnu: {algo}")
 
     def _create_header(self, file_size: int, checksum8: bytes) -> bytes:
         hdr = bytearray(22)
         hdr[0:8] = file_size.to_bytes(8, 'little')
         hdr[8:10] = self.chunk_size.to_bytes(2, 'little')
         hdr[10] = self.error_correction
-        hdr[11] = 0  # reserved
+        hdr[11] = self.HEADER_VERSION_CRC32 | (self.chunk_crc << 4)
         hdr[12:20] = checksum8
-        crc16 = self._crc16_ccitt(bytes(hdr[:20]))
+        crc16 = self._header_crc(bytes(hdr[:20]), self.HEADER_VERSION_CRC32)
         hdr[20:22] = crc16.to_bytes(2, 'little')
         return bytes(hdr)
 
     def _parse_header(self, hdr: bytes) -> dict:
         if len(hdr) < 22:
             raise ValueError("Header trop court")
-        crc_calc = self._crc16_ccitt(hdr[:20])
+        crc_calc = self._header_crc(bytes(hdr[:20]), hdr[11] & 0x0F)
         crc_read = int.from_bytes(hdr[20:22], 'little')
         if crc_calc != crc_read:
             raise ValueError("CRC16 du header invalide")
@@ -210,6 +279,9 @@ class DNAStorage:
         file_size = int.from_bytes(hdr[0:8], 'little')
         chunk_size = int.from_bytes(hdr[8:10], 'little')
         nsym = hdr[10]
+        chunk_crc = hdr[11] >> 4
+        if chunk_crc not in (self.CHUNK_CRC_ZLIB, self.CHUNK_CRC_CRC32C):
+            raise ValueError(f"Algorithme CRC de chunk inconnu: {chunk_crc}")
         checksum8 = hdr[12:20]
         num_chunks = (file_size + chunk_size - 1) // chunk_size
         # revalide contrainte RS
@@ -220,24 +292,53 @@ class DNAStorage:
             'file_size': file_size,
             'chunk_size': chunk_size,
             'nsym': nsym,
+            'chunk_crc': chunk_crc,
             'checksum8': checksum8,
             'num_chunks': num_chunks,
         }
 
     # ---------- Encodage / Décodage haut niveau ----------
 
+    # nombre minimal de chunks par worker pour justifier un pool de processus
+    PARALLEL_MIN_CHUNKS = 256
+
+    # taille des blocs lus (multiple de chunk_size) pour le hash et l'encodage en flux
+    STREAM_BUFFER = 1 << 20
+
+    @staticmethod
+    def _sha256_stream(f) -> bytes:
+        # SHA-256 en flux: le fichier n'est jamais chargé en entier
+        if hasattr(hashlib, 'file_digest'):  # Python ≥ 3.11
+            return hashlib.file_digest(f, 'sha256').digest()
+        h = hashlib.sha256()
+        buf = memoryview(bytearray(DNAStorage.STREAM_BUFFER))
+        while n := f.readinto(buf):
+            h.update(buf[:n])
+        return h.digest()
+
+    def _iter_chunks(self, f):
+        # Lecture par blocs, chunks = vues memoryview sur chaque bloc (sans copie)
+        block = self.chunk_size * max(1, self.STREAM_BUFFER // self.chunk_size)
+        while buf := f.read(block):
+            mv = memoryview(buf)
+            for i in range(0, len(buf), self.chunk_size):
+                yield mv[i:i+self.chunk_size]
+
     def encode_file(self, file_path: str) -> List[str]:
         with open(file_path, 'rb') as f:
-            data = f.read()
+            checksum8 = self._sha256_stream(f)[:8]
+            file_size = f.tell()
+            f.seek(0)
+            return self._encode_stream(f, file_size, checksum8)
 
-        file_size = len(data)
-        checksum8 = hashlib.sha256(data).digest()[:8]
+    def _encode_stream(self, f, file_size: int, checksum8: bytes) -> List[str]:
         header_bytes = self._create_header(file_size, checksum8)
+        total_chunks = (file_size + self.chunk_size - 1) // self.chunk_size
 
         # Header → ADN (une séquence, fortement répliquée)
         header_dna = bytes_to_dna_goldman(header_bytes, start='A')
         header_prefix = self._create_prefix(
-            chunk_idx=0, total_chunks=(file_size + self.chunk_size - 1) // self.chunk_size,
+            chunk_idx=0, total_chunks=total_chunks,
             seq_type='H', seq_idx=0, total_seqs=1
         )
         header_seq = header_prefix + header_dna
@@ -246,65 +347,85 @@ class DNAStorage:
         for _ in range(self.redundancy * 2):
             sequences.append(header_seq)
 
-        # Split en chunks (bytes)
-        chunks = [data[i:i+self.chunk_size] for i in range(0, file_size, self.chunk_size)]
-        rs = RSCodec(self.error_correction)
-
-        for chunk_idx, chunk in enumerate(chunks, start=1):
-            # CRC-32 sur le chunk (avant RS)
-            crc32 = zlib.crc32(chunk) & 0xFFFFFFFF
-            payload = chunk + crc32.to_bytes(4, 'little')  # longueur data_RS = chunk+4
-
-            # RS encode → codeword de longueur data_RS + nsym (≤255)
-            codeword = rs.encode(payload)
-            data_rs = codeword[:len(payload)]      # partie données (incl. CRC32)
-            parity_rs = codeword[len(payload):]    # parité
-
-            # bytes → ADN (avec re-seed simple pour contraintes)
-            data_dna = self._encode_with_constraints(data_rs)
-            parity_dna = self._encode_with_constraints(parity_rs)
-
-            # Découper en segments ADN
-            data_segments = [data_dna[i:i+self.segment_nt] for i in range(0, len(data_dna), self.segment_nt)]
-            parity_segments = [parity_dna[i:i+self.segment_nt] for i in range(0, len(parity_dna), self.segment_nt)]
-            total_seqs = len(data_segments) + len(parity_segments)
-            if total_seqs >= 256:
-                raise ValueError("Trop de segments par chunk (>255). Augmenter segment_nt ou réduire chunk_size/nsym.")
-
-            # Créer séquences + préfixes, avec réplication
-            # Data
-            for seq_i, seg in enumerate(data_segments):
-                prefix = self._create_prefix(
-                    chunk_idx=chunk_idx,
-                    total_chunks=len(chunks),
-                    seq_type='D',
-                    seq_idx=seq_i,
-                    total_seqs=total_seqs
-                )
-                seq = prefix + seg
-                for _ in range(self.redundancy):
-                    sequences.append(seq)
-
-            # Parity
-            for p_i, seg in enumerate(parity_segments):
-                prefix = self._create_prefix(
-                    chunk_idx=chunk_idx,
-                    total_chunks=len(chunks),
-                    seq_type='P',
-                    seq_idx=len(data_segments) + p_i,
-                    total_seqs=total_seqs
-                )
-                seq = prefix + seg
-                for _ in range(self.redundancy):
-                    sequences.append(seq)
+        # Chunks indépendants: encodage parallèle si le fichier est assez gros pour amortir les workers
+        workers = min(self.workers, total_chunks // self.PARALLEL_MIN_CHUNKS)
+        if workers > 1:
+            # ex.map consomme tout son itérable d'entrée: soumission par fenêtres pour que
+            # seule une fenêtre de chunks soit en mémoire (comme en séquentiel)
+            window = workers * self.PARALLEL_MIN_CHUNKS
+            config = self._config()
+            chunks = self._iter_chunks(f)
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                for start in range(1, total_chunks + 1, window):
+                    batch = [bytes(c) for c in islice(chunks, window)]   # memoryview non picklable
+                    results = ex.map(
+                        _encode_chunk_worker,
+                        repeat(config),
+                        range(start, start + len(batch)),
+                        batch,
+                        repeat(total_chunks),
+                        chunksize=self.PARALLEL_MIN_CHUNKS // 4,
+                    )
+                    for chunk_seqs in results:
+                        sequences.extend(chunk_seqs)
+        else:
+            for chunk_idx, chunk in enumerate(self._iter_chunks(f), start=1):
+                sequences.extend(self._encode_one_chunk(chunk_idx, chunk, total_chunks))
+
+        return sequences
+
+    def _encode_one_chunk(self, chunk_idx: int, chunk: bytes, total_chunks: int) -> List[str]:
+        """Encode un chunk (CRC32 + RS + ADN + préfixes) en séquences répliquées."""
+        rs = self._rs(self.error_correction)
+        sequences: List[str] = []
+        # CRC-32 sur le chunk (avant RS)
+        crc32 = self._chunk_crc(chunk, self.chunk_crc)
+        payload = bytearray(chunk)                     # seule copie du chunk
+        payload += crc32.to_bytes(4, 'little')         # longueur data_RS = chunk+4
+
+        # RS encode → codeword de longueur data_RS + nsym (≤255)
+        codeword = rs.encode(payload)
+        data_rs = codeword[:len(payload)]      # partie données (incl. CRC32)
+        parity_rs = codeword[len(payload):]    # parité
+
+        # bytes → ADN (avec re-seed simple pour contraintes)
+        data_dna = self._encode_with_constraints(data_rs)
+        parity_dna = self._encode_with_constraints(parity_rs)
+
+        # Découper en segments ADN
+        data_segments = [data_dna[i:i+self.segment_nt] for i in range(0, len(data_dna), self.segment_nt)]
+        parity_segments = [parity_dna[i:i+self.segment_nt] for i in range(0, len(parity_dna), self.segment_nt)]
+        total_seqs = len(data_segments) + len(parity_segments)
+        if total_seqs >= 256:
+            raise ValueError("Trop de segments par chunk (>255). Augmenter segment_nt ou réduire chunk_size/nsym.")
+
+        # Créer séquences + préfixes, avec réplication
+        prefix_for = self._prefix_builder(chunk_idx, total_chunks, total_seqs)
+        # Data
+        for seq_i, seg in enumerate(data_segments):
+            prefix = prefix_for('D', seq_i)
+            seq = prefix + seg
+            for _ in range(self.redundancy):
+                sequences.append(seq)
+
+        # Parity
+        for p_i, seg in enumerate(parity_segments):
+            prefix = prefix_for('P', len(data_segments) + p_i)
+            seq = prefix + seg
+            for _ in range(self.redundancy):
+                sequences.append(seq)
 
         return sequences
 
     def decode_sequences(self, sequences: List[str]) -> Tuple[bool, bytes]:
-        # Parser tous les préfixes valides
+        # Parser tous les préfixes valides (une seule fois par read distinct: les réplicats
+        # identiques partagent le même résultat, leur multiplicité est conservée pour le vote)
         parsed = []
+        parse_cache = {}
         for s in sequences:
-            info = self._parse_prefix(s)
+            info = parse_cache.get(s, False)
+            if info is False:
+                info = parse_cache[s] = self._parse_prefix(s)
             if info:
                 parsed.append(info)
         if not parsed:
@@ -322,31 +443,46 @@ class DNAStorage:
             return False, b""
 
         nsym = header['nsym']
-        rs = RSCodec(nsym)
+        rs = self._rs(nsym)
 
-        # Grouper par chunk
-        chunks_map = {}  # chunk_idx -> {'total_seqs': int, 'data': {seq_idx:[reads]}, 'parity':{seq_idx:[reads]}}
+        # Grouper par chunk dans des listes préindexées: reads[chunk_idx][seq_idx] -> [payloads]
+        # (bornées par le plus grand chunk_idx lu: un header corrompu ne fait pas allouer 2^64 entrées)
+        num_chunks = min(header['num_chunks'], max(p['chunk_idx'] for p in parsed))
+        data_reads = [None] * (num_chunks + 1)
+        parity_reads = [None] * (num_chunks + 1)
         for p in parsed:
-            if p['seq_type'] == 'H':
+            seq_type = p['seq_type']
+            if seq_type == 'H':
                 continue
             ci = p['chunk_idx']
-            ts = p['total_seqs']
+            if not 0 < ci <= num_chunks:
+                continue
+            by_chunk = data_reads if seq_type == 'D' else parity_reads
+            slots = by_chunk[ci]
+            if slots is None:
+                slots = by_chunk[ci] = []
             si = p['seq_idx']
-            kind = 'data' if p['seq_type'] == 'D' else 'parity'
-            entry = chunks_map.setdefault(ci, {'total_seqs': ts, 'data': {}, 'parity': {}})
-            entry['total_seqs'] = max(entry['total_seqs'], ts)
-            entry[kind].setdefault(si, []).append(p['payload'])
-
+            if si >= len(slots):
+                slots.extend([None] * (si + 1 - len(slots)))
+            if slots[si] is None:
+                slots[si] = [p['payload']]
+            else:
+                slots[si].append(p['payload'])
+
+        # Checksum global calculé au fil des chunks, tronqué à la taille exacte
         reconstructed = []
-        for ci in range(1, header['num_chunks'] + 1):
-            entry = chunks_map.get(ci)
-            if not entry:
+        remaining = header['file_size']
+        hasher = hashlib.sha256()
+        for ci in range(1, num_chunks + 1):
+            data_slots = data_reads[ci]
+            parity_slots = parity_reads[ci]
+            if data_slots is None and parity_slots is None:
                 # chunk manquant
                 continue
 
-            # reconstruire le flux data/parity par ordre de seq_idx
-            data_seq = ''.join(self._consensus(entry['data'][i]) for i in sorted(entry['data'].keys()))
-            parity_seq = ''.join(self._consensus(entry['parity'][i]) for i in sorted(entry['parity'].keys()))
+            # reconstruire le flux data/parity par ordre de seq_idx (emplacements vides ignorés)
+            data_seq = ''.join(self._consensus(r) for r in data_slots or () if r)
+            parity_seq = ''.join(self._consensus(r) for r in parity_slots or () if r)
 
             try:
                 data_bytes_rs = dna_to_bytes_goldman(data_seq, start='A') if data_seq else b""
@@ -366,61 +502,71 @@ class DNAStorage:
                 continue
             payload = decoded[:-4]
             crc_read = int.from_bytes(decoded[-4:], 'little')
-            if (zlib.crc32(payload) & 0xFFFFFFFF) != crc_read:
+            if self._chunk_crc(payload, header['chunk_crc']) != crc_read:
                 # CRC chunk invalide → on jette ce chunk
                 continue
 
+            if remaining <= 0:
+                continue
+            if len(payload) > remaining:
+                payload = payload[:remaining]
+            remaining -= len(payload)
+            hasher.update(payload)
             reconstructed.append(payload)
 
-        file_bytes = b''.join(reconstructed)
-        # Tronquer à la taille exacte
-        file_bytes = file_bytes[:header['file_size']]
-
-        # Vérifier checksum global
-        ok = hashlib.sha256(file_bytes).digest()[:8] == header['checksum8']
-        return (ok, file_bytes if ok else b"")
+        # Vérifier checksum global (assemblage seulement si OK)
+        ok = hasher.digest()[:8] == header['checksum8']
+        return (ok, b''.join(reconstructed) if ok else b"")
 
     # ---------- Aides encodage/consensus/contraintes ----------
 
+    # Goldman: base suivante = base précédente + 1 + trit (mod 4, ordre ACGT), donc partir
+    # de la base d'index s revient à décaler de s chaque base de l'encodage depuis 'A'
+    _START_ROTATION = tuple(str.maketrans('ACGT', 'ACGT'[s:] + 'ACGT'[:s]) for s in range(4))
+
     def _encode_with_constraints(self, b: bytes) -> str:
         """Encode bytes→ADN avec Goldman et essaie différents 'start' pour satisfaire GC/run."""
-        for start in ('A', 'C', 'G', 'T'):
-            dna = bytes_to_dna_goldman(b, start=start)
-            if passes_constraints(dna):
-                return dna
+        dna = bytes_to_dna_goldman(b, start='A')
+        if not dna:
+            return dna
+        # Taux GC de chaque départ (A, C, G, T) à partir des comptes de l'encodage 'A'.
+        # Goldman ne produit jamais d'homopolymère: la contrainte de run est toujours respectée.
+        n = len(dna)
+        a, c, g, t = (dna.count(base) for base in 'ACGT')
+        for s, gc in enumerate((c + g, a + c, a + t, g + t)):
+            if GC_MIN <= gc / n <= GC_MAX:
+                return dna.translate(self._START_ROTATION[s]) if s else dna
         # Si rien ne passe, retourner la meilleure (la moins mauvaise) — ici la première
-        return bytes_to_dna_goldman(b, start='A')
+        return dna
 
     @staticmethod
     def _consensus(reads: List[str]) -> str:
-        if not reads:
-            return ''
-        if len(reads) == 1:
-            return reads[0]
-        L = max(len(s) for s in reads)
-        out = []
-        for i in range(L):
-            col = [s[i] for s in reads if i < len(s)]
-            if not col:
-                continue
-            out.append(Counter(col).most_common(1)[0][0])
-        return ''.join(out)
+        # vote majoritaire par position (functions/consensus.py)
+        return consensus(reads)
 
     # ---------- I/O pratiques ----------
 
     @staticmethod
     def save_sequences(sequences: List[str], output_file: str):
+        # une seule écriture (pas de concaténation par ligne)
         with open(output_file, 'w') as f:
-            for s in sequences:
-                f.write(s + "\n")
+            if sequences:
+                f.write('\n'.join(sequences) + '\n')
 
     @staticmethod
     def load_sequences(input_file: str) -> List[str]:
-        out = []
-        with open(input_file, 'r') as f:
-            for line in f:
-                s = line.strip().upper()
-                if s and all(c in "ACGT" for c in s):
-                    out.append(s)
-        return out
+        # validation en C: une ligne ADN est vide une fois les bases ACGT supprimées
+        with open(input_file, 'rb') as f:
+            lines = f.read().splitlines()
+        return [s.decode('ascii') for s in (line.strip().upper() for line in lines)
+                if s and not s.translate(None, b'ACGT')]
+
+
+# Encodeurs des processus workers (un par configuration, réutilisés entre chunks)
+_WORKER_ENCODERS = {}
 
+def _encode_chunk_worker(config: tuple, chunk_idx: int, chunk: bytes, total_chunks: int) -> List[str]:
+    enc = _WORKER_ENCODERS.get(config)
+    if enc is None:
+        enc = _WORKER_ENCODERS[config] = DNAStorage(*config, workers=1)
+    return enc._encode_one_chunk(chunk_idx, chunk, total_chunks)
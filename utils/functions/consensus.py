@@ -1,18 +1,38 @@
 from typing import List
-from collections import Counter
+
+
+class _ColumnVotes(dict):
+    """Mémo colonne → base gagnante (≤ 4^R colonnes possibles pour R reads ACGT)."""
+    MAX_SIZE = 1 << 16
+
+    def __missing__(self, col: str) -> str:
+        if len(self) >= self.MAX_SIZE:
+            self.clear()
+        winner = self[col] = max(col, key=col.count)
+        return winner
+
+_COLUMN_VOTES = _ColumnVotes()
 
 
 def consensus(reads: List[str]) -> str:
-    """Vote majoritaire par position. N'utilise pas de scores de qualité."""
+    """Vote majoritaire par position. N'utilise pas de scores de qualité.
+
+    En cas d'égalité, la base vue en premier (ordre des reads) l'emporte.
+    """
     if not reads:
         return ''
-    if len(reads) == 1:
-        return reads[0]
+    first = reads[0]
+    if reads.count(first) == len(reads):
+        # Reads tous identiques (cas sans bruit): aucun vote nécessaire
+        return first
     L = max(len(s) for s in reads)
+    if all(len(s) == L for s in reads):
+        # Reads de même longueur: transposition en C via zip, vote mémoïsé par colonne
+        return ''.join(map(_COLUMN_VOTES.__getitem__, map(''.join, zip(*reads))))
     out = []
     for i in range(L):
         col = [s[i] for s in reads if i < len(s)]
         if not col:
             continue
-        out.append(Counter(col).most_common(1)[0][0])
-    return ''.join(out)
\ No newline at end of file
+        out.append(max(col, key=col.count))
+    return ''.join(out)
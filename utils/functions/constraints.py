@@ -1,27 +1,47 @@
+import re
+
+# Contraintes par défaut (homopolymère max, bornes du taux GC)
+MAX_RUN = 3
+GC_MIN = 0.40
+GC_MAX = 0.60
 
 def gc_content(seq: str) -> float:
     if not seq:
         return 0.0
-    gc = sum(1 for c in seq if c in "GC")
-    return gc / len(seq)
+    return (seq.count('G') + seq.count('C')) / len(seq)
+
+def _has_run(seq: str, k: int) -> bool:
+    """Vrai si seq contient k caractères identiques consécutifs (scan regex en C)."""
+    if k <= 1:
+        return bool(seq)
+    return re.search(r'(.)\1{%d}' % (k - 1), seq, re.DOTALL) is not None
 
 def max_run_length(seq: str) -> int:
     if not seq:
         return 0
-    m, cur, prev = 1, 1, seq[0]
-    for c in seq[1:]:
-        if c == prev:
-            cur += 1
-            m = max(m, cur)
+    # Doublement puis dichotomie sur des recherches de sous-chaîne (c*k in seq, en C, sans
+    # retour arrière); seules les bases ayant encore un run assez long restent candidates
+    bases = set(seq)
+    lo, step = 1, 1
+    while True:
+        longer = [c for c in bases if c * (lo + step) in seq]
+        if not longer:
+            break
+        bases, lo, step = longer, lo + step, step * 2
+    hi = lo + step
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        longer = [c for c in bases if c * mid in seq]
+        if longer:
+            bases, lo = longer, mid
         else:
-            cur = 1
-            prev = c
-    return m
+            hi = mid
+    return lo
 
-def passes_constraints(seq: str, max_run: int = 3, gc_min: float = 0.40, gc_max: float = 0.60) -> bool:
+def passes_constraints(seq: str, max_run: int = MAX_RUN, gc_min: float = GC_MIN, gc_max: float = GC_MAX) -> bool:
     if not seq:
         return False
-    if max_run_length(seq) > max_run:
+    if _has_run(seq, max_run + 1):
         return False
     gc = gc_content(seq)
     return gc_min <= gc <= gc_max
\ No newline at end of file
@@ -7,11 +7,8 @@ def bits_to_bytes(bits: str) -> bytes:
     if not bits:
         return b""
     pad = (-len(bits)) % 8
-    bits_padded = bits + ("0" * pad)
-    out = bytearray()
-    for i in range(0, len(bits_padded), 8):
-        out.append(int(bits_padded[i:i+8], 2))
-    return bytes(out)
+    # une seule conversion entier (C) pour toute la chaîne
+    return int(bits + ("0" * pad), 2).to_bytes((len(bits) + pad) // 8, 'big')
 
 def bytes_to_bits(x: int, nbits: int) -> str:
     return format(x, f'0{nbits}b')
@@ -25,15 +22,41 @@ GOLDMAN_ENCODE = {
 GOLDMAN_DECODE = {last: {nuc: val for val, nuc in mapping.items()}
                   for last, mapping in GOLDMAN_ENCODE.items()}
 
+# Tables plates dérivées de GOLDMAN_ENCODE (bases indexées A=0, C=1, G=2, T=3)
+_BASES = 'ACGT'
+_BASE_CODES = b'ACGT'
+_BASE_INDEX = {b: i for i, b in enumerate(_BASES)}
+# _GOLDMAN_ENC[last][trit] → index de la base suivante
+_GOLDMAN_ENC = tuple(tuple(_BASE_INDEX[GOLDMAN_ENCODE[last][t]] for t in range(3)) for last in _BASES)
+
+def _goldman_dec_table() -> bytes:
+    """[(last << 8) | code ASCII] → trit, 3 si transition invalide (ligne 4: départ invalide)."""
+    table = bytearray([3] * (5 * 256))
+    for last, mapping in GOLDMAN_DECODE.items():
+        for nuc, val in mapping.items():
+            table[(_BASE_INDEX[last] << 8) | ord(nuc)] = val
+    return bytes(table)
+
+_GOLDMAN_DEC = _goldman_dec_table()
+# code ASCII → index de base (3 par défaut, jamais lu pour une transition invalide)
+_CODE_INDEX = bytes(_BASE_INDEX.get(chr(c), 3) for c in range(256))
+
+def _byte_trits(v: int) -> tuple:
+    out = []
+    for _ in range(6):
+        v, r = divmod(v, 3)
+        out.append(r)
+    return tuple(out)
+
+# octet → ses 6 trits (LSB → MSB)
+_BYTE_TRITS = tuple(_byte_trits(v) for v in range(256))
+
 def bytes_to_trits(data: bytes) -> List[int]:
     """Chaque octet 0..255 → 6 trits (LSB → MSB en base 3)."""
-    trits: List[int] = []
-    for byte in data:
-        v = int(byte)
-        for _ in range(6):
-            v, r = divmod(v, 3)
-            trits.append(r)
-    return trits
+    table = _BYTE_TRITS
+    return [t for byte in data for t in table[byte]]
+
+_TRITS = frozenset((0, 1, 2))
 
 def trits_to_bytes(trits: List[int], byte_length: Optional[int] = None) -> bytes:
     """Inverse strict de bytes_to_trits (ignore les trits incomplets)."""
@@ -42,38 +65,90 @@ def trits_to_bytes(trits: List[int], byte_length: Optional[int] = None) -> bytes
     n = (len(trits) // 6) * 6
     out = bytearray()
     for i in range(0, n, 6):
-        val = 0
-        for j, t in enumerate(trits[i:i+6]):
-            if t not in (0, 1, 2):
-                raise ValueError("Trit invalide")
-            val += t * (3 ** j)
-        if not (0 <= val <= 255):
+        group = trits[i:i+6]
+        if not _TRITS.issuperset(group):
+            raise ValueError("Trit invalide")
+        t0, t1, t2, t3, t4, t5 = group
+        val = t0 + 3*t1 + 9*t2 + 27*t3 + 81*t4 + 243*t5
+        if val > 255:
             raise ValueError(f"Pack 6-trits invalide → {val}")
         out.append(val)
     result = bytes(out)
     return result[:byte_length] if (byte_length is not None) else result
 
 def trits_to_dna(trits: List[int], start: str = 'A') -> str:
-    last = start
-    dna = []
-    for t in trits:
-        nxt = GOLDMAN_ENCODE[last][t]
-        dna.append(nxt)
-        last = nxt
-    return ''.join(dna)
+    enc = _GOLDMAN_ENC
+    last = _BASE_INDEX[start]
+    out = bytearray(len(trits))
+    for i, t in enumerate(trits):
+        if not 0 <= t <= 2:
+            raise ValueError("Trit invalide")
+        last = enc[last][t]
+        out[i] = _BASE_CODES[last]
+    return out.decode('ascii')
 
 def dna_to_trits(dna: str, start: str = 'A') -> List[int]:
-    last = start
-    trits: List[int] = []
-    for base in dna:
-        if base not in GOLDMAN_DECODE.get(last, {}):
-            raise ValueError(f"Transition non valide: {last}->{base}")
-        trits.append(GOLDMAN_DECODE[last][base])
-        last = base
+    dec = _GOLDMAN_DEC
+    idx = _CODE_INDEX
+    codes = dna.encode('ascii', 'replace')  # hors ASCII → '?' (transition invalide)
+    last = _BASE_INDEX.get(start, 4)
+    trits = [0] * len(codes)
+    for i, code in enumerate(codes):
+        t = dec[(last << 8) | code]
+        if t == 3:
+            prev = dna[i - 1] if i else start
+            raise ValueError(f"Transition non valide: {prev}->{dna[i]}")
+        trits[i] = t
+        last = idx[code]
     return trits
 
+def _goldman_group_tables():
+    """Tables fusionnées par groupe de 6 trits (un octet ↔ 6 bases), par base précédente.
+    enc[last][octet] = (6 bases, nouvelle last) ; dec[last][6 bases] = (valeur 0..728, nouvelle last)."""
+    enc = [[None] * 256 for _ in range(4)]
+    dec = [{} for _ in range(4)]
+    for start in range(4):
+        for v in range(729):
+            last = start
+            out = []
+            for t in _byte_trits(v):
+                last = _GOLDMAN_ENC[last][t]
+                out.append(_BASES[last])
+            group = ''.join(out)
+            dec[start][group] = (v, last)
+            if v < 256:
+                enc[start][v] = (group, last)
+    return tuple(tuple(row) for row in enc), tuple(dec)
+
+_GOLDMAN_BYTE_ENC, _GOLDMAN_BYTE_DEC = _goldman_group_tables()
+
 def bytes_to_dna_goldman(data: bytes, start: str = 'A') -> str:
-    return trits_to_dna(bytes_to_trits(data), start=start)
+    """Équivalent à trits_to_dna(bytes_to_trits(data)), une recherche par octet."""
+    table = _GOLDMAN_BYTE_ENC
+    last = _BASE_INDEX[start]
+    parts = []
+    for byte in data:
+        group, last = table[last][byte]
+        parts.append(group)
+    return ''.join(parts)
 
 def dna_to_bytes_goldman(dna: str, start: str = 'A') -> bytes:
-    return trits_to_bytes(dna_to_trits(dna, start=start))
\ No newline at end of file
+    """Équivalent à trits_to_bytes(dna_to_trits(dna)), une recherche par groupe de 6 bases."""
+    last = _BASE_INDEX.get(start)
+    if last is None:
+        return trits_to_bytes(dna_to_trits(dna, start=start))
+    table = _GOLDMAN_BYTE_DEC
+    n = len(dna) - len(dna) % 6
+    out = bytearray(n // 6)
+    try:
+        for k in range(n // 6):
+            v, last = table[last][dna[6 * k:6 * k + 6]]
+            if v > 255:
+                raise KeyError(v)
+            out[k] = v
+    except KeyError:
+        # Transition ou pack invalide: le chemin trit par trit lève l'erreur exacte
+        return trits_to_bytes(dna_to_trits(dna, start=start))
+    if n < len(dna):
+        dna_to_trits(dna[n:], start=_BASES[last])  # trits incomplets ignorés mais validés
+    return bytes(out)
\ No newline at end of file
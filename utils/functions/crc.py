@@ -1,21 +1,66 @@
+def _crc8_table(poly: int) -> bytes:
+    """Table CRC-8 (Sarwate, un octet par recherche) pour un polynôme donné."""
+    table = bytearray(256)
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = ((c << 1) & 0xFF) ^ poly if (c & 0x80) else (c << 1) & 0xFF
+        table[i] = c
+    return bytes(table)
+
+def _crc16_table(poly: int) -> tuple:
+    """Table CRC-16 (MSB first) pour un polynôme donné."""
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ poly) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+# Tables précalculées, indexées par polynôme (complétées à la demande)
+_CRC8_TABLES = {0x07: _crc8_table(0x07)}
+_CRC16_TABLES = {0x1021: _crc16_table(0x1021)}
 
 def crc8(data: bytes, poly: int = 0x07, init: int = 0x00) -> int:
     """CRC-8 (polynôme x^8 + x^2 + x + 1 = 0x07)."""
-    c = init
+    table = _CRC8_TABLES.get(poly)
+    if table is None:
+        table = _CRC8_TABLES[poly] = _crc8_table(poly)
+    c = init & 0xFF
     for b in data:
-        c ^= b
-        for _ in range(8):
-            c = ((c << 1) & 0xFF) ^ poly if (c & 0x80) else (c << 1) & 0xFF
-    return c & 0xFF
+        c = table[c ^ b]
+    return c
 
 def crc16_ccitt(data: bytes, poly: int = 0x1021, init: int = 0xFFFF) -> int:
     """CRC-16-CCITT (X25). Retourne un entier 0..65535."""
+    table = _CRC16_TABLES.get(poly)
+    if table is None:
+        table = _CRC16_TABLES[poly] = _crc16_table(poly)
     crc = init & 0xFFFF
     for b in data:
-        crc ^= (b << 8) & 0xFFFF
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+def _crc32c_table() -> tuple:
+    """Table CRC-32C (Castagnoli, réfléchi 0x82F63B78)."""
+    table = []
+    for i in range(256):
+        crc = i
         for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ poly) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return crc & 0xFFFF
\ No newline at end of file
+            crc = (crc >> 1) ^ 0x82F63B78 if (crc & 1) else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+_CRC32C_TABLE = _crc32c_table()
+
+def crc32c(data: bytes, init: int = 0) -> int:
+    """CRC-32C (Castagnoli), repli pur Python du paquet optionnel `crc32c`."""
+    table = _CRC32C_TABLE
+    crc = ~init & 0xFFFFFFFF
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return ~crc & 0xFFFFFFFF